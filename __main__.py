@@ -18,18 +18,21 @@ from infra.orchestration.organization import (
 # 2. IPAM Orchestration
 from infra.orchestration.ipam import (
     create_rirs, create_asns, create_vrfs,
-    create_aggregates, create_prefixes
+    create_aggregates, create_prefixes,
+    create_vlan_groups, create_vlans
 )
 
 # 3. DCIM Orchestration
 from infra.orchestration.dcim import (
     create_manufacturers, create_device_roles,
-    create_device_types, create_interface_templates, create_devices
+    create_device_types, create_interface_templates, create_devices,
+    create_config_contexts, render_config_contexts
 )
 
 # 4. Utility Import (Assuming utils/data_reader.py)
+import pulumi
 from utils.data_reader import read_yaml_data
-from utils.exports import run_exports
+from utils.exports import run_exports, export_id_index
 
 
 # ---------------------------------
@@ -45,9 +48,11 @@ sites_locations_data = read_yaml_data(['data', 'organization', 'sites_locations.
 rirs_asns_data = read_yaml_data(['data', 'ipam', 'rirs_asns.yaml'])
 vrfs_data = read_yaml_data(['data', 'ipam', 'vrfs.yaml'])
 prefixes_data = read_yaml_data(['data', 'ipam', 'prefixes.yaml'])
+vlans_data = read_yaml_data(['data', 'ipam', 'vlans.yaml'])
 
 # DCIM Data
 dcim_data = read_yaml_data(['data', 'dcim', 'devices.yaml'])
+config_context_data = read_yaml_data(['data', 'dcim', 'config_contexts.yaml'])
 
 
 # ---------------------------------
@@ -86,6 +91,7 @@ locations = create_locations(sites_locations_data.get('locations', []), sites_ou
 # 3. ORCHESTRATION: IPAM 🌐
 # ---------------------------------
 # Ensure correct dependency order: RIRs -> ASNs/Aggregates | VRFs -> Prefixes
+# | Sites -> VLAN Groups -> VLANs
 
 # 3.1 Create RIRs
 rir_resources = create_rirs(rirs_asns_data.get('rirs', []))
@@ -102,11 +108,22 @@ aggregates = create_aggregates(prefixes_data.get('aggregates', []), rir_resource
 # 3.5 Create Prefixes (Passes Vrf resources for dependency)
 prefixes = create_prefixes(prefixes_data.get('prefixes', []), vrf_resources)
 
+# 3.6 Create VLAN Groups (Depends on Sites)
+vlan_groups = create_vlan_groups(vlans_data.get('vlan_groups', []), sites_outputs)
+
+# 3.7 Create VLANs (IDs allocated per VLAN Group; depends on VLAN Groups and Tenants)
+vlans = create_vlans(
+    vlans_data.get('vlans', []),
+    vlans_data.get('vlan_groups', []),
+    vlan_groups,
+    tenants
+)
+
 
 # ---------------------------------
 # 4. ORCHESTRATION: DCIM 💻
 # ---------------------------------
-# Ensure correct dependency order: Manuf -> Roles -> Types -> Interfaces -> Devices
+# Ensure correct dependency order: Manuf -> Roles -> Types -> Interfaces/Contexts -> Devices
 
 # 4.1 Create Manufacturers
 manufacturers = create_manufacturers(dcim_data.get('manufacturers', []))
@@ -118,9 +135,19 @@ device_roles = create_device_roles(dcim_data.get('device_roles', []))
 device_types = create_device_types(dcim_data.get('device_types', []), manufacturers)
 
 # 4.4 Create Interface Templates (Depends on Device Types, honors SRP)
-create_interface_templates(dcim_data.get('device_types', []), device_types)
+interface_templates = create_interface_templates(dcim_data.get('device_types', []), device_types)
+
+# 4.5 Create shared Config Contexts (Depends on Device Roles and Device Types)
+config_contexts = create_config_contexts(config_context_data, device_roles, device_types)
 
-# 4.5 Create Devices (The main orchestration point for all resources)
+# 4.6 Render per-Device Config Contexts (ASN, loopback, BGP neighbors; checks the ASNs)
+device_contexts = render_config_contexts(
+    dcim_data.get('devices', {}),
+    config_context_data,
+    asns
+)
+
+# 4.7 Create Devices (The main orchestration point for all resources)
 
 # Collect ALL dependencies into one dictionary for the device creation function
 all_dependencies = {
@@ -130,7 +157,8 @@ all_dependencies = {
     'sites': sites_outputs,
     'locations': locations,
     'tenants': tenants,
-    'asns': asns
+    # The device ASN reaches NetBox through its rendered config context (step 4.6)
+    'config_contexts': device_contexts
     # Note: IPAM resources (VRFs/Prefixes) are not direct dependencies of netbox.Device,
     # but are needed for the next step (Interfaces/IPs).
 }
@@ -147,3 +175,30 @@ run_exports(
     sites=sites_outputs,
     devices=device_resources
 )
+
+# Full slug -> ID maps for every kind (optionally written to a local index file,
+# e.g. `pulumi config set idIndexPath netbox-ids.json`)
+export_id_index(
+    {
+        'TenantGroup': tenant_groups,
+        'Tenant': tenants,
+        'Region': regions,
+        'SiteGroup': site_groups,
+        'Site': sites_outputs,
+        'Location': locations,
+        'Rir': rir_resources,
+        'Vrf': vrf_resources,
+        'Asn': asns,
+        'Aggregate': aggregates,
+        'Prefix': prefixes,
+        'VlanGroup': vlan_groups,
+        'Vlan': vlans,
+        'Manufacturer': manufacturers,
+        'DeviceRole': device_roles,
+        'DeviceType': device_types,
+        'InterfaceTemplate': interface_templates,
+        'ConfigContext': config_contexts,
+        'Device': device_resources,
+    },
+    index_path=pulumi.Config().get('idIndexPath')
+)
@@ -2,7 +2,9 @@
 
 import pulumi_netbox as netbox
 from pulumi import Output
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from utils.naming import interface_template_resource_name
+from utils.netbox_lookup import resolve_id
 
 # ===============================================
 # 1. ATOMIC CREATION HELPERS (STRICT SRP)
@@ -49,7 +51,7 @@ def _create_single_device_type(
 def _create_single_interface_template(
         interface_data: Dict[str, Any],
         device_type_resource: netbox.DeviceType, device_type_slug: str
-        ):
+        ) -> netbox.InterfaceTemplate:
     """
     Creates a single Interface Template resource, handling Device Type dependency.
     FIXED: Uses the simple string 'device_type_slug' instead of resource.slug.get().
@@ -57,14 +59,33 @@ def _create_single_interface_template(
     interface_name = interface_data['name']
 
     # Use the simple string slug (passed from orchestrator) to form a unique Pulumi resource name
-    interface_slug = f"{device_type_slug}-{interface_name}".lower().replace('-', '_')
-
-    netbox.InterfaceTemplate(interface_slug,
-                             device_type_id=device_type_resource.id.apply(lambda id: int(id)),
-                             name=interface_name,
-                             type=interface_data['type'],
-                             mgmt_only=interface_data.get('mgmt_only', False)
-                             )
+    interface_slug = interface_template_resource_name(device_type_slug, interface_name)
+    device_type_id_input = device_type_resource.id.apply(lambda id: int(id))
+
+    return netbox.InterfaceTemplate(interface_slug,
+                                    device_type_id=device_type_id_input,
+                                    name=interface_name,
+                                    type=interface_data['type'],
+                                    mgmt_only=interface_data.get('mgmt_only', False)
+                                    )
+
+
+def _create_single_config_context(
+        context_name: str, data_json: str, weight: int,
+        role_ids: Optional[List[Output]] = None,
+        device_type_ids: Optional[List[Output]] = None
+        ) -> netbox.ConfigContext:
+    """
+    Creates a single shared Config Context resource, assigned to Device Roles and/or
+    Device Types. 'data_json' must be canonical JSON (see utils/config_context.py).
+    """
+    return netbox.ConfigContext(context_name,
+                                name=context_name,
+                                data=data_json,
+                                weight=weight,
+                                roles=role_ids,
+                                device_types=device_type_ids
+                                )
 
 # ===============================================
 # 2. DEVICE INSTANCE ATOMIC LOGIC
@@ -75,19 +96,23 @@ def _resolve_device_dependencies(
         data: Dict[str, Any],
         all_deps: Dict[str, Any]
         ) -> Dict[str, Output]:
-    """Helper function to resolve all required NetBox resource IDs for a single Device."""
+    """
+    Helper function to resolve all required NetBox resource IDs for a single Device.
+    References to objects not managed here are resolved through the NetBox lookup cache.
+    """
 
-    def to_int_id(resource):
-        # Local helper to convert resource object ID to the required Output[int]
-        return resource.id.apply(lambda id: int(id))
+    platform_slug = data.get('platform_slug')
 
     return {
-        'role_id': to_int_id(all_deps['device_roles'][data['device_role_slug']]),
-        'device_type_id': to_int_id(all_deps['device_types'][data['device_type_slug']]),
-        'site_id': to_int_id(all_deps['sites'][data['site_slug']]),
-        'location_id': to_int_id(all_deps['locations'][data['location_slug']]),
-        'tenant_id': to_int_id(all_deps['tenants'][data['tenant_slug']]),
-        'asn_id': to_int_id(all_deps['asns'][data['asn']]),
+        'role_id': resolve_id(all_deps['device_roles'], 'device_role', data['device_role_slug']),
+        'device_type_id': resolve_id(
+            all_deps['device_types'], 'device_type', data['device_type_slug']
+            ),
+        'site_id': resolve_id(all_deps['sites'], 'site', data['site_slug']),
+        'location_id': resolve_id(all_deps['locations'], 'location', data['location_slug']),
+        'tenant_id': resolve_id(all_deps['tenants'], 'tenant', data['tenant_slug']),
+        # Platforms are never managed by this program
+        'platform_id': resolve_id({}, 'platform', platform_slug) if platform_slug else None,
     }
 
 
@@ -110,6 +135,9 @@ def create_single_device(
                            site_id=dep_ids['site_id'],
                            location_id=dep_ids['location_id'],
                            tenant_id=dep_ids['tenant_id'],
+                           platform_id=dep_ids['platform_id'],
+                           # Rendered routing intent (ASN, loopback, BGP neighbors)
+                           local_context_data=all_deps.get('config_contexts', {}).get(device_name),
                            asset_tag=device_name.upper(),
                            status="active"
                            )
@@ -2,6 +2,9 @@
 
 import pulumi_netbox as netbox
 from typing import Dict, Any
+from utils.naming import asn_resource_name, prefix_resource_name, vlan_resource_name
+from utils.netbox_lookup import resolve_id
+from utils.vlan_allocator import VLAN_ID_MIN, VLAN_ID_MAX
 
 # --- Atomic RIRs and ASNs ---
 
@@ -23,7 +26,7 @@ def _create_single_asn(
         ) -> netbox.Asn:
     """Creates ONLY a single Asn resource. Handles RIR dependency."""
     asn = asn_data['asn']
-    asn_slug = f"asn-{asn}"
+    asn_slug = asn_resource_name(asn)
 
     rir_resource = rir_resources.get(asn_data.get('rir_slug'))
 
@@ -56,7 +59,7 @@ def _create_single_aggregate(
         rir_resources: Dict[str, netbox.Rir]
         ) -> netbox.Aggregate:
     """Creates ONLY a single Aggregate resource. Handles RIR dependency."""
-    agg_name = agg_data['prefix'].replace('/', '_').replace('.', '_')
+    agg_name = prefix_resource_name(agg_data['prefix'])
 
     rir_resource = rir_resources.get(agg_data.get('rir_slug'))
 
@@ -76,7 +79,7 @@ def _create_single_prefix(
         ) -> netbox.Prefix:
     """Creates ONLY a single Prefix resource. Handles VRF dependency."""
     prefix_value = prefix_data['prefix']
-    prefix_name = prefix_value.replace('/', '_').replace('.', '_')
+    prefix_name = prefix_resource_name(prefix_value)
 
     vrf_resource = vrf_resources.get(prefix_data.get('vrf_slug'))
 
@@ -93,3 +96,56 @@ def _create_single_prefix(
                          vrf_id=vrf_id_input,
                          description=prefix_data.get('description')
                          )
+
+# --- Atomic VLAN Groups and VLANs ---
+
+
+def _create_single_vlan_group(
+        group_data: Dict[str, Any],
+        site_resources: Dict[str, netbox.Site]
+        ) -> netbox.VlanGroup:
+    """Creates ONLY a single VlanGroup resource. Handles optional Site scope dependency."""
+    group_slug = group_data['slug']
+    site_slug_ref = group_data.get('site_slug')
+
+    site_id_input = resolve_id(site_resources, 'site', site_slug_ref) if site_slug_ref else None
+
+    return netbox.VlanGroup(group_slug,
+                            name=group_data['name'],
+                            slug=group_slug,
+                            scope_type='dcim.site' if site_id_input is not None else None,
+                            scope_id=site_id_input,
+                            vid_ranges=[[
+                                group_data.get('min_vid', VLAN_ID_MIN),
+                                group_data.get('max_vid', VLAN_ID_MAX)
+                            ]],
+                            description=group_data.get('description')
+                            )
+
+
+def _create_single_vlan(
+        vlan_data: Dict[str, Any],
+        vlan_group_resources: Dict[str, netbox.VlanGroup],
+        tenant_resources: Dict[str, netbox.Tenant]
+        ) -> netbox.Vlan:
+    """
+    Creates ONLY a single Vlan resource. Handles VLAN Group and optional Tenant dependencies.
+    The 'vid' must already be resolved (see utils/vlan_allocator.py).
+    """
+    group_slug = vlan_data['group_slug']
+    tenant_slug_ref = vlan_data.get('tenant_slug')
+
+    # Cast VLAN Group ID to integer output for NetBox API stability
+    group_id_input = vlan_group_resources[group_slug].id.apply(lambda id: int(id))
+    tenant_id_input = (
+        resolve_id(tenant_resources, 'tenant', tenant_slug_ref) if tenant_slug_ref else None
+    )
+
+    return netbox.Vlan(vlan_resource_name(group_slug, vlan_data['slug']),
+                       name=vlan_data['name'],
+                       vid=vlan_data['vid'],
+                       group_id=group_id_input,
+                       tenant_id=tenant_id_input,
+                       status=vlan_data.get('status', 'active'),
+                       description=vlan_data.get('description')
+                       )
@@ -3,6 +3,7 @@
 import pulumi_netbox as netbox
 from pulumi import Output
 from typing import Dict, Any
+from utils.netbox_lookup import resolve_id
 
 # --- Atomic Tenant Groups and Tenants ---
 
@@ -90,8 +91,7 @@ def _create_single_location(
     location_slug = location_data['slug']
     site_slug_ref = location_data.get('site_slug')
 
-    site_resource = site_resources.get(site_slug_ref)
-    site_id_input = site_resource.id.apply(lambda id: int(id)) if site_resource else None
+    site_id_input = resolve_id(site_resources, 'site', site_slug_ref) if site_slug_ref else None
 
     return netbox.Location(location_slug,
                            name=location_data['name'],
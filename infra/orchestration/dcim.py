@@ -6,8 +6,10 @@ from typing import Dict, List, Any
 from infra.atomic.dcim import (
     _create_single_manufacturer, _create_single_device_role,
     _create_single_device_type, _create_single_interface_template,
-    create_single_device
+    _create_single_config_context, create_single_device
 )
+from utils.config_context import group_fragments, render_device_contexts
+from utils.naming import config_context_resource_name, interface_template_resource_name
 
 
 # ===============================================
@@ -56,24 +58,79 @@ def create_device_types(
 def create_interface_templates(
         type_data_list: List[Dict[str, Any]],
         device_type_resources: Dict[str, netbox.DeviceType]
-        ):
+        ) -> Dict[str, netbox.InterfaceTemplate]:
     """Responsibility: Orchestrate the creation of ALL Interface Templates."""
     print("-> Creating Interface Templates...")
+    created_templates = {}
     for type_data in type_data_list:
         device_type_slug = type_data['slug']
         device_type_resource = device_type_resources[device_type_slug]
 
         for interface_data in type_data.get('interfaces', []):
             # Pass the simple string slug to the atomic function
-            _create_single_interface_template(
+            template = _create_single_interface_template(
                 interface_data,
                 device_type_resource,
                 device_type_slug
                 )
+            template_name = interface_template_resource_name(
+                device_type_slug, interface_data['name']
+                )
+            created_templates[template_name] = template
+    return created_templates
+
+
+# ===============================================
+# 2. CONFIG CONTEXT ORCHESTRATION 🔁
+# ===============================================
+# Device Types are more specific than Roles: their fragments win on conflicts
+ROLE_CONTEXT_WEIGHT = 1000
+TYPE_CONTEXT_WEIGHT = 1100
+
+
+def create_config_contexts(
+        context_data: Dict[str, Any],
+        role_resources: Dict[str, netbox.DeviceRole],
+        device_type_resources: Dict[str, netbox.DeviceType]
+        ) -> Dict[str, netbox.ConfigContext]:
+    """
+    Responsibility: Orchestrate the creation of the shared Role/Type Config Contexts.
+    Identical fragments are created once and assigned to every Role/Type sharing them.
+    """
+    print("-> Creating Config Contexts...")
+    created_contexts = {}
+    scopes = [
+        ('role', context_data.get('role_fragments'), role_resources, ROLE_CONTEXT_WEIGHT),
+        ('type', context_data.get('type_fragments'), device_type_resources, TYPE_CONTEXT_WEIGHT),
+    ]
+    for scope, fragments, resources, weight in scopes:
+        for slugs, data_json in group_fragments(fragments):
+            context_name = config_context_resource_name(scope, slugs)
+            ids = [resources[slug].id.apply(lambda id: int(id)) for slug in slugs]
+            created_contexts[context_name] = _create_single_config_context(
+                context_name, data_json, weight,
+                role_ids=ids if scope == 'role' else None,
+                device_type_ids=ids if scope == 'type' else None
+                )
+    return created_contexts
+
+
+def render_config_contexts(
+        device_data_dict: Dict[str, Any],
+        context_data: Dict[str, Any],
+        asn_resources: Dict[int, netbox.Asn]
+        ) -> Dict[str, str]:
+    """
+    Responsibility: Render the local Config Context (canonical JSON) of every Device in
+    one pass (neighbor lists shared per role), BEFORE the Devices are created.
+    Every Device ASN must be one of the managed ASNs.
+    """
+    print("-> Rendering Device Config Contexts...")
+    return render_device_contexts(device_data_dict, context_data, asn_resources.keys())
 
 
 # ===============================================
-# 2. DEVICE INSTANCE ORCHESTRATION 🔁
+# 3. DEVICE INSTANCE ORCHESTRATION 🔁
 # ===============================================
 
 def create_devices(
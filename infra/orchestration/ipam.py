@@ -5,8 +5,11 @@ from typing import Dict, List, Any
 # Import all atomic helpers
 from infra.atomic.ipam import (
     _create_single_rir, _create_single_asn, _create_single_vrf,
-    _create_single_aggregate, _create_single_prefix
+    _create_single_aggregate, _create_single_prefix,
+    _create_single_vlan_group, _create_single_vlan
 )
+from utils.naming import vlan_resource_name
+from utils.vlan_allocator import iter_vlan_allocations
 
 
 # --- Orchestration RIRs and ASNs (Preserves original function signature) ---
@@ -72,3 +75,36 @@ def create_prefixes(
         prefix = _create_single_prefix(prefix_data, vrf_resources)
         created_prefixes[prefix_data['prefix']] = prefix
     return created_prefixes
+
+# --- Orchestration VLAN Groups and VLANs ---
+
+
+def create_vlan_groups(
+        group_data_list: List[Dict[str, Any]],
+        site_resources: Dict[str, netbox.Site]
+        ) -> Dict[str, netbox.VlanGroup]:
+    """Responsibility: Orchestrate the creation of ALL VlanGroup resources."""
+    print("-> Creating VLAN Groups...")
+    created_groups = {}
+    for group_data in group_data_list:
+        group = _create_single_vlan_group(group_data, site_resources)
+        created_groups[group_data['slug']] = group
+    return created_groups
+
+
+def create_vlans(
+        vlan_data_list: List[Dict[str, Any]],
+        group_data_list: List[Dict[str, Any]],
+        vlan_group_resources: Dict[str, netbox.VlanGroup],
+        tenant_resources: Dict[str, netbox.Tenant]
+        ) -> Dict[str, netbox.Vlan]:
+    """
+    Responsibility: Orchestrate the creation of ALL Vlan resources.
+    VLAN IDs are allocated per group by the generator, one bitmap lookup per VLAN.
+    """
+    print("-> Creating VLANs...")
+    created_vlans = {}
+    for vlan_data in iter_vlan_allocations(group_data_list, vlan_data_list):
+        vlan = _create_single_vlan(vlan_data, vlan_group_resources, tenant_resources)
+        created_vlans[vlan_resource_name(vlan_data['group_slug'], vlan_data['slug'])] = vlan
+    return created_vlans
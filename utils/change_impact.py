@@ -0,0 +1,168 @@
+# utils/change_impact.py
+
+"""
+Maps a git diff of data/ to the Pulumi URNs it affects (including transitive
+dependents), so CI can run targeted previews and updates.
+
+Usage:
+    python -m utils.change_impact --stack lab --base origin/main
+    mapfile -d '' TARGETS < <(python -m utils.change_impact --stack lab --base origin/main \
+                              --format args)
+    (( ${#TARGETS[@]} )) && pulumi preview "${TARGETS[@]}"
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, Iterable, List, Optional, Set
+
+import yaml
+
+from utils.data_reader import ROOT_DIR, read_yaml_data
+from utils.resource_graph import (
+    NodeKey, ResourceNode, build_resource_graph, load_project_data,
+    reverse_dependencies, type_token
+)
+
+
+# ===============================================
+# 1. GIT HELPERS
+# ===============================================
+
+def _git(*args: str) -> str:
+    """Runs a git command from the project root and returns its stdout."""
+    result = subprocess.run(['git', *args], cwd=ROOT_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+def changed_data_files(base: str, head: Optional[str] = None) -> List[str]:
+    """
+    Lists the files under data/ that differ between 'base' and 'head' (or the work tree,
+    including untracked files, which 'git diff' does not report).
+    """
+    revisions = [base] if head is None else [base, head]
+    output = _git('diff', '--name-only', *revisions, '--', 'data/')
+    if head is None:
+        output += _git('ls-files', '--others', '--exclude-standard', '--', 'data/')
+    return [line for line in output.splitlines() if line]
+
+
+def _revision_reader(revision: Optional[str]):
+    """Returns a reader for load_project_data() bound to a git revision (None = work tree)."""
+
+    def read(path_segments: List[str]) -> Optional[dict]:
+        if revision is None:
+            try:
+                return read_yaml_data(path_segments)
+            except FileNotFoundError:
+                return None
+        try:
+            content = _git('show', f"{revision}:{'/'.join(path_segments)}")
+        except RuntimeError:
+            # The file does not exist at this revision
+            return None
+        return yaml.safe_load(content)
+
+    return read
+
+
+# ===============================================
+# 2. IMPACT COMPUTATION
+# ===============================================
+
+def _dependents_closure(
+        seeds: Iterable[NodeKey],
+        nodes: Dict[NodeKey, ResourceNode]
+        ) -> Set[NodeKey]:
+    """Returns 'seeds' (restricted to 'nodes') plus every transitive dependent."""
+    dependents = reverse_dependencies(nodes)
+    stack = [key for key in seeds if key in nodes]
+    closure = set(stack)
+    while stack:
+        for dependent in dependents[stack.pop()]:
+            if dependent not in closure:
+                closure.add(dependent)
+                stack.append(dependent)
+    return closure
+
+
+def compute_affected(
+        old_nodes: Dict[NodeKey, ResourceNode],
+        new_nodes: Dict[NodeKey, ResourceNode],
+        include_dependents: bool = True
+        ) -> Set[NodeKey]:
+    """
+    Returns the resources added, removed or modified between both graphs and,
+    unless disabled, every resource depending on them (in either graph).
+    """
+    seeds = {
+        key for key in old_nodes.keys() | new_nodes.keys()
+        if key not in old_nodes or key not in new_nodes
+        or old_nodes[key].fingerprint != new_nodes[key].fingerprint
+    }
+    if not include_dependents:
+        return seeds
+    return _dependents_closure(seeds, old_nodes) | _dependents_closure(seeds, new_nodes)
+
+
+def resource_urn(stack: str, project: str, key: NodeKey) -> str:
+    """Builds the URN of a top-level resource registered by this program."""
+    kind, name = key
+    return f"urn:pulumi:{stack}::{project}::{type_token(kind)}::{name}"
+
+
+def project_name() -> str:
+    """Reads the Pulumi project name from Pulumi.yaml."""
+    with open(os.path.join(ROOT_DIR, 'Pulumi.yaml'), 'r') as f:
+        return yaml.safe_load(f)['name']
+
+
+def affected_urns(
+        stack: str, base: str, head: Optional[str] = None,
+        include_dependents: bool = True
+        ) -> List[str]:
+    """Returns the sorted URNs affected by the data/ changes between 'base' and 'head'."""
+    if not changed_data_files(base, head):
+        return []
+
+    old_nodes = build_resource_graph(load_project_data(_revision_reader(base)))
+    new_nodes = build_resource_graph(load_project_data(_revision_reader(head)))
+    affected = compute_affected(old_nodes, new_nodes, include_dependents)
+
+    project = project_name()
+    return sorted(resource_urn(stack, project, key) for key in affected)
+
+
+# ===============================================
+# 3. COMMAND LINE
+# ===============================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--stack', required=True, help="Pulumi stack name (e.g. 'lab').")
+    parser.add_argument('--base', required=True, help="Git revision to diff against.")
+    parser.add_argument('--head', default=None,
+                        help="Git revision to compare (default: the work tree).")
+    parser.add_argument('--format', choices=['urns', 'args'], default='urns',
+                        help="'urns': one URN per line; 'args': NUL-delimited '--target URN' "
+                             "arguments (for 'mapfile -d' or 'xargs -0').")
+    parser.add_argument('--no-dependents', action='store_true',
+                        help="Only report directly changed resources.")
+    args = parser.parse_args(argv)
+
+    urns = affected_urns(args.stack, args.base, args.head, not args.no_dependents)
+    print(f"-> {len(urns)} affected resource(s).", file=sys.stderr)
+
+    if args.format == 'args':
+        # NUL-delimited: no shell quoting involved, whatever characters the URNs contain
+        sys.stdout.write(''.join(f"--target\0{urn}\0" for urn in urns))
+    else:
+        print('\n'.join(urns))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
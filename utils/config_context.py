@@ -0,0 +1,208 @@
+# utils/config_context.py
+
+import hashlib
+import ipaddress
+import json
+import string
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def _canonical_json(value: Any) -> str:
+    """Byte-stable JSON: unchanged inputs always give the exact same string (no diff)."""
+    return json.dumps(value, sort_keys=True, separators=(',', ':'))
+
+
+# ===============================================
+# 1. TEMPLATE RENDERING
+# ===============================================
+
+def _render_value(
+        template: Any,
+        variables: Dict[str, Any],
+        text_variables: Dict[str, str]
+        ) -> Any:
+    """
+    Recursively substitutes '${var}' placeholders. A string made of a single
+    placeholder keeps the variable type (int, list, ...); otherwise it is interpolated
+    with 'text_variables' (non-string values as canonical JSON, never a Python repr).
+    """
+    if isinstance(template, dict):
+        return {
+            key: _render_value(value, variables, text_variables)
+            for key, value in template.items()
+        }
+    if isinstance(template, list):
+        return [_render_value(value, variables, text_variables) for value in template]
+    if isinstance(template, str):
+        stripped = template.strip()
+        if stripped.startswith('${') and stripped.endswith('}') and stripped.count('$') == 1:
+            return variables[stripped[2:-1]]
+        return string.Template(template).substitute(text_variables)
+    return template
+
+
+def render_context(template: Any, variables: Dict[str, Any]) -> str:
+    """Renders a template to canonical JSON."""
+    text_variables = {
+        name: value if isinstance(value, str) else _canonical_json(value)
+        for name, value in variables.items()
+    }
+    return _canonical_json(_render_value(template, variables, text_variables))
+
+
+# ===============================================
+# 2. FABRIC VARIABLES (ASN, LOOPBACK, BGP PEERS)
+# ===============================================
+
+def _device_loopbacks(devices: Dict[str, Any], fabric: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Loopback of each device: the explicit 'loopback' if set, else the host of
+    'fabric.loopback_prefix' derived from the device slug (stable hash) when free.
+    Devices whose derived host is taken (in slug order) get the next free host, so only
+    a full prefix fails; pin a device with 'loopback' when its address must not change.
+    """
+    network = None
+    if fabric.get('loopback_prefix'):
+        network = ipaddress.ip_network(fabric['loopback_prefix'])
+
+    loopbacks: Dict[str, str] = {}
+    owners: Dict[Any, str] = {}  # address -> device using it
+
+    def take(name: str, address):
+        owners[address] = name
+        loopbacks[name] = str(address)
+
+    for name, data in devices.items():
+        if 'loopback' in data:
+            address = ipaddress.ip_interface(data['loopback']).ip
+            if address in owners:
+                raise ValueError(
+                    f"Device '{name}': loopback {address} is already used by "
+                    f"'{owners[address]}'."
+                    )
+            take(name, address)
+
+    # 1. Every device takes its derived host if free (on a tie, the smallest slug wins)
+    collided = []
+    for name in sorted(devices):
+        if name in loopbacks:
+            continue
+        if network is None or network.num_addresses < 4:
+            raise ValueError(f"Device '{name}': no 'loopback' and no usable loopback_prefix.")
+        # Hosts are offsets 1..N-2 (network and broadcast addresses excluded)
+        digest = hashlib.sha256(name.encode('utf-8')).digest()
+        offset = 1 + int.from_bytes(digest[:8], 'big') % (network.num_addresses - 2)
+        address = network.network_address + offset
+        if address in owners:
+            collided.append((name, address))
+        else:
+            take(name, address)
+
+    # 2. The others, in slug order, take the next free host after their derived one
+    for name, address in collided:
+        free = next((candidate for candidate in _hosts_from(network, address)
+                     if candidate not in owners), None)
+        if free is None:
+            raise ValueError(f"Device '{name}': no free address left in {network}.")
+        take(name, free)
+    return loopbacks
+
+
+def _hosts_from(network, start) -> Iterator[Any]:
+    """Hosts of 'network' from 'start' onwards, wrapping around once."""
+    first, last = network.network_address + 1, network.broadcast_address - 1
+    address = start
+    for _ in range(network.num_addresses - 2):
+        address = address + 1 if address < last else first
+        yield address
+
+
+def build_device_variables(
+        devices: Dict[str, Any],
+        fabric: Dict[str, Any],
+        managed_asns: Optional[Iterable[int]] = None
+        ) -> Dict[str, Dict[str, Any]]:
+    """
+    Derives the template variables of every device: name, role, site, asn,
+    router_id/loopback and its BGP neighbors (from the role pairs in 'fabric.peering').
+    When 'managed_asns' is given, every device ASN must be one of them.
+    """
+    if managed_asns is not None:
+        known = set(managed_asns)
+        for name, data in sorted(devices.items()):
+            if data.get('asn') not in known:
+                raise ValueError(
+                    f"Device '{name}': ASN {data.get('asn')} is not defined in "
+                    f"data/ipam/rirs_asns.yaml."
+                    )
+
+    loopbacks = _device_loopbacks(devices, fabric)
+    peering = fabric.get('peering', {})
+
+    # Neighbor entries are built once per device and indexed by role (one pass)
+    neighbors_by_role: Dict[str, List[Dict[str, Any]]] = {}
+    for name, data in sorted(devices.items()):
+        neighbors_by_role.setdefault(data['device_role_slug'], []).append(
+            {'name': name.upper(), 'asn': data['asn'], 'address': loopbacks[name]}
+        )
+
+    # Neighbor list of each role, built once and shared by every device of that role
+    role_neighbors: Dict[str, List[Dict[str, Any]]] = {}
+
+    def neighbors_of_role(role: str) -> List[Dict[str, Any]]:
+        if role not in role_neighbors:
+            role_neighbors[role] = sorted(
+                (neighbor
+                 for peer_role in peering.get(role, [])
+                 for neighbor in neighbors_by_role.get(peer_role, [])),
+                key=lambda neighbor: neighbor['name']
+            )
+        return role_neighbors[role]
+
+    variables = {}
+    for name, data in devices.items():
+        role = data['device_role_slug']
+        neighbors = neighbors_of_role(role)
+        if role in peering.get(role, []):
+            # Devices peering within their own role must not list themselves
+            neighbors = [neighbor for neighbor in neighbors if neighbor['name'] != name.upper()]
+        variables[name] = {
+            'name': name.upper(),
+            'slug': name,
+            'role': data['device_role_slug'],
+            'site': data['site_slug'],
+            'asn': data['asn'],
+            'router_id': loopbacks[name],
+            'loopback': f"{loopbacks[name]}/{ipaddress.ip_address(loopbacks[name]).max_prefixlen}",
+            'neighbors': neighbors,
+        }
+    return variables
+
+
+def render_device_contexts(
+        devices: Dict[str, Any],
+        context_data: Dict[str, Any],
+        managed_asns: Optional[Iterable[int]] = None
+        ) -> Dict[str, str]:
+    """Renders the local config context (canonical JSON) of every device in one pass."""
+    template = context_data.get('device_template')
+    if not template:
+        return {}
+    variables = build_device_variables(devices, context_data.get('fabric', {}), managed_asns)
+    return {name: render_context(template, variables[name]) for name in devices}
+
+
+# ===============================================
+# 3. SHARED ROLE / TYPE FRAGMENTS
+# ===============================================
+
+def group_fragments(fragments: Dict[str, Any]) -> List[Tuple[List[str], str]]:
+    """
+    Groups identical fragments: returns one (sorted slugs, canonical JSON) pair per
+    distinct fragment, so a single Config Context serves every slug sharing it.
+    """
+    groups: Dict[str, Tuple[List[str], str]] = {}
+    for slug, fragment in sorted((fragments or {}).items()):
+        rendered = _canonical_json(fragment)
+        groups.setdefault(rendered, ([], rendered))[0].append(slug)
+    return sorted(groups.values())
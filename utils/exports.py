@@ -1,11 +1,57 @@
 # utils/exports.py
 
+import json
+import os
 import pulumi
-from typing import Dict
+from pulumi import Output
+from typing import Any, Dict, Optional
 # Import the NetBox resource types for cleaner type hints
 from pulumi_netbox import Tenant, Vrf, Site, Device
 
 
+def _export_id_map(kind: str, resources: Dict[Any, pulumi.CustomResource]) -> Output:
+    """
+    Resolves every resource ID of a kind with ONE batched Output.all and exports
+    the resulting slug -> ID map as '<kind>IDs'.
+    """
+    if resources:
+        id_map = Output.all(
+            **{str(slug): resource.id for slug, resource in resources.items()}
+        ).apply(lambda ids: {slug: int(id) for slug, id in sorted(ids.items())})
+    else:
+        id_map = Output.from_input({})
+
+    pulumi.export(f"{kind}IDs", id_map)
+    return id_map
+
+
+def _write_id_index(index: Dict[str, Dict[str, int]], index_path: str) -> str:
+    """Atomically writes the compact kind -> slug -> ID index file."""
+    tmp_path = f"{index_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f, sort_keys=True, separators=(',', ':'))
+    os.replace(tmp_path, index_path)
+    return index_path
+
+
+def export_id_index(
+        resource_maps: Dict[str, Dict[Any, pulumi.CustomResource]],
+        index_path: Optional[str] = None
+        ):
+    """
+    Exports a slug -> ID map for every kind in 'resource_maps' (kind -> slug -> resource)
+    and, when 'index_path' is set, writes them all to a local JSON index so downstream
+    tooling (Ansible, clab) can resolve IDs without querying NetBox.
+    """
+    print("-> Exporting Slug -> ID Index...")
+
+    id_maps = {kind: _export_id_map(kind, resources) for kind, resources in resource_maps.items()}
+
+    # IDs are unknown during a preview: only write the index on a real update
+    if index_path and not pulumi.runtime.is_dry_run():
+        Output.all(**id_maps).apply(lambda index: _write_id_index(index, index_path))
+
+
 def run_exports(
     tenants: Dict[str, Tenant],
     vrf_resources: Dict[str, Vrf],
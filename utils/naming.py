@@ -0,0 +1,34 @@
+# utils/naming.py
+
+from typing import List, Union
+
+# ===============================================
+# PULUMI RESOURCE NAMING RULES
+# ===============================================
+# Single source of truth for the logical names used by infra/atomic/*.
+# Kept free of Pulumi imports so CI tooling can compute URNs offline.
+
+
+def prefix_resource_name(prefix: str) -> str:
+    """Name used for Aggregate and Prefix resources (e.g. '10.0.0.0/8' -> '10_0_0_0_8')."""
+    return prefix.replace('/', '_').replace('.', '_')
+
+
+def asn_resource_name(asn: Union[int, str]) -> str:
+    """Name used for Asn resources (e.g. 65001 -> 'asn-65001')."""
+    return f"asn-{asn}"
+
+
+def interface_template_resource_name(device_type_slug: str, interface_name: str) -> str:
+    """Name used for Interface Template resources (e.g. 'ceos_lab_ethernet1')."""
+    return f"{device_type_slug}-{interface_name}".lower().replace('-', '_')
+
+
+def vlan_resource_name(group_slug: str, vlan_slug: str) -> str:
+    """Name used for VLAN resources, unique across VLAN groups (e.g. 'lab-vlans-mgmt')."""
+    return f"{group_slug}-{vlan_slug}"
+
+
+def config_context_resource_name(scope: str, slugs: List[str]) -> str:
+    """Name used for shared Config Contexts (e.g. 'ctx-role-leaf+spine')."""
+    return f"ctx-{scope}-{'+'.join(sorted(slugs))}"
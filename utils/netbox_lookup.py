@@ -0,0 +1,250 @@
+# utils/netbox_lookup.py
+
+"""
+Read-only lookups of NetBox objects NOT managed by this program (existing
+platforms, tags, sites owned by other teams, custom fields, ...).
+
+Each kind is list-fetched once (one paginated API walk) and cached on disk
+with a TTL, so previews make no repeated reads and work offline against a
+warm cache.
+
+Usage:
+    python -m utils.netbox_lookup --invalidate            # drop the whole cache
+    python -m utils.netbox_lookup --invalidate platform   # drop one kind
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.request
+from typing import Any, Dict, Optional, Union
+
+from utils.data_reader import ROOT_DIR
+
+# kind -> (API endpoint, lookup field). Kinds match utils/resource_graph.py.
+LOOKUP_ENDPOINTS: Dict[str, tuple] = {
+    'tenant_group': ('tenancy/tenant-groups', 'slug'),
+    'tenant': ('tenancy/tenants', 'slug'),
+    'region': ('dcim/regions', 'slug'),
+    'site_group': ('dcim/site-groups', 'slug'),
+    'site': ('dcim/sites', 'slug'),
+    'location': ('dcim/locations', 'slug'),
+    'manufacturer': ('dcim/manufacturers', 'slug'),
+    'device_role': ('dcim/device-roles', 'slug'),
+    'device_type': ('dcim/device-types', 'slug'),
+    'platform': ('dcim/platforms', 'slug'),
+    'rir': ('ipam/rirs', 'slug'),
+    'tag': ('extras/tags', 'slug'),
+    'custom_field': ('extras/custom-fields', 'name'),
+}
+
+DEFAULT_CACHE_PATH = os.path.join(ROOT_DIR, '.netbox-cache', 'lookups.json')
+DEFAULT_TTL_SECONDS = 3600
+PAGE_SIZE = 1000
+
+
+class NetboxLookup:
+    """Slug -> ID resolver backed by one list-fetch per kind and an on-disk TTL cache."""
+
+    def __init__(
+            self, server_url: Optional[str], api_token: Optional[str],
+            cache_path: str = DEFAULT_CACHE_PATH,
+            ttl_seconds: int = DEFAULT_TTL_SECONDS,
+            offline: bool = False
+            ):
+        self.server_url = (server_url or '').rstrip('/')
+        self.api_token = api_token
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_seconds
+        self.offline = offline
+        # Kinds already resolved during this run (never re-read from disk or API)
+        self._memory: Dict[str, Dict[str, int]] = {}
+        self._fetched_this_run = set()
+
+    # --- Disk cache ---
+
+    def _read_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_path, 'r') as f:
+                cache = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return cache if isinstance(cache, dict) else {}
+
+    def _cached_entry(self, kind: str) -> Optional[Dict[str, Any]]:
+        """The cached entry of a kind, or None if missing or malformed (treated as a miss)."""
+        server_cache = self._read_cache().get(self.server_url)
+        entry = server_cache.get(kind) if isinstance(server_cache, dict) else None
+        if (not isinstance(entry, dict)
+                or not isinstance(entry.get('fetched_at'), (int, float))
+                or not isinstance(entry.get('ids'), dict)):
+            return None
+        return entry
+
+    def _write_cache(self, cache: Dict[str, Any]):
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f, sort_keys=True, separators=(',', ':'))
+        os.replace(tmp_path, self.cache_path)
+
+    def invalidate(self, kind: Optional[str] = None):
+        """Drops one kind (or every kind) of the current server from memory and disk."""
+        cache = self._read_cache()
+        if kind is None:
+            self._memory.clear()
+            cache.pop(self.server_url, None)
+        else:
+            self._memory.pop(kind, None)
+            cache.get(self.server_url, {}).pop(kind, None)
+        self._write_cache(cache)
+
+    # --- API ---
+
+    def _fetch(self, kind: str) -> Dict[str, int]:
+        """List-fetches every object of a kind (brief mode, paginated)."""
+        if not self.server_url or not self.api_token:
+            raise RuntimeError("NetBox serverUrl/apiToken are not configured.")
+
+        endpoint, field = LOOKUP_ENDPOINTS[kind]
+        url = f"{self.server_url}/api/{endpoint}/?brief=1&limit={PAGE_SIZE}"
+        headers = {'Authorization': f"Token {self.api_token}", 'Accept': 'application/json'}
+
+        ids = {}
+        while url:
+            request = urllib.request.Request(url, headers=headers)
+            with urllib.request.urlopen(request, timeout=30) as response:
+                page = json.load(response)
+            try:
+                for obj in page['results']:
+                    ids[obj[field]] = obj['id']
+                url = page.get('next')
+            except (KeyError, TypeError, AttributeError) as e:
+                # e.g. a proxy error page or an API version with another payload shape
+                raise ValueError(f"Unexpected '{endpoint}' API answer ({e!r})") from e
+        return ids
+
+    def _load_kind(self, kind: str, force: bool = False) -> Dict[str, int]:
+        if kind not in LOOKUP_ENDPOINTS:
+            raise KeyError(f"Unsupported lookup kind '{kind}'.")
+        if kind in self._memory and not force:
+            return self._memory[kind]
+
+        entry = self._cached_entry(kind)
+        is_fresh = entry and time.time() - entry['fetched_at'] < self.ttl_seconds
+
+        if entry and not force and (is_fresh or self.offline):
+            self._memory[kind] = entry['ids']
+            return entry['ids']
+
+        if self.offline:
+            raise RuntimeError(f"Offline mode: no cached '{kind}' lookups available.")
+
+        try:
+            ids = self._fetch(kind)
+        except (OSError, ValueError) as e:
+            if not entry:
+                raise
+            # NetBox unreachable or unusable answer: fall back to the stale cache
+            print(f"Warning: Using stale '{kind}' lookup cache ({e}).")
+            self._memory[kind] = entry['ids']
+            return entry['ids']
+
+        cache = self._read_cache()
+        if not isinstance(cache.get(self.server_url), dict):
+            cache[self.server_url] = {}
+        cache[self.server_url][kind] = {'fetched_at': time.time(), 'ids': ids}
+        self._write_cache(cache)
+        self._memory[kind] = ids
+        self._fetched_this_run.add(kind)
+        return ids
+
+    def get_id(self, kind: str, slug: str) -> int:
+        """
+        Returns the NetBox ID of an unmanaged object. A cached miss triggers ONE refetch
+        (the object may have been created since the cache was warmed).
+        """
+        ids = self._load_kind(kind)
+        if slug not in ids and kind not in self._fetched_this_run and not self.offline:
+            ids = self._load_kind(kind, force=True)
+        try:
+            return ids[slug]
+        except KeyError:
+            raise KeyError(f"NetBox {kind} '{slug}' not found (managed or existing).") from None
+
+
+# ===============================================
+# SHARED INSTANCE FOR THE PULUMI PROGRAM
+# ===============================================
+
+_lookup: Optional[NetboxLookup] = None
+
+
+def get_lookup() -> NetboxLookup:
+    """
+    Lazily builds the program-wide lookup from the stack configuration, so no API
+    call (or cache read) happens while every reference is managed by this program.
+
+    Config: netbox:serverUrl, netbox:apiToken, lookupCacheTtl (seconds).
+    Env: NETBOX_LOOKUP_REFRESH=1 drops the cache first, NETBOX_LOOKUP_OFFLINE=1 never
+    calls the API.
+    """
+    global _lookup
+    if _lookup is None:
+        # Imported here so the CLI below runs without the Pulumi SDK
+        import pulumi
+
+        netbox_config = pulumi.Config('netbox')
+        _lookup = NetboxLookup(
+            netbox_config.get('serverUrl') or os.environ.get('NETBOX_SERVER_URL'),
+            netbox_config.get('apiToken') or os.environ.get('NETBOX_API_TOKEN'),
+            ttl_seconds=pulumi.Config().get_int('lookupCacheTtl') or DEFAULT_TTL_SECONDS,
+            offline=os.environ.get('NETBOX_LOOKUP_OFFLINE') == '1'
+        )
+        if os.environ.get('NETBOX_LOOKUP_REFRESH') == '1':
+            _lookup.invalidate()
+    return _lookup
+
+
+def resolve_id(managed: Dict[str, Any], kind: str, slug: str) -> Union[Any, int]:
+    """
+    Resolves a slug reference for the atomic helpers: the Output[int] ID of the
+    resource managed by this program if any, else the ID of the existing NetBox object.
+    """
+    resource = managed.get(slug)
+    if resource is not None:
+        return resource.id.apply(lambda id: int(id))
+    return get_lookup().get_id(kind, slug)
+
+
+# ===============================================
+# COMMAND LINE
+# ===============================================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Manage the NetBox lookup cache.")
+    parser.add_argument('--invalidate', nargs='*', metavar='KIND', required=True,
+                        help="Kinds to drop (default: every kind of every server).")
+    parser.add_argument('--cache-path', default=DEFAULT_CACHE_PATH)
+    args = parser.parse_args(argv)
+
+    if not args.invalidate:
+        if os.path.exists(args.cache_path):
+            os.remove(args.cache_path)
+        print("-> Lookup cache cleared.")
+        return 0
+
+    lookup = NetboxLookup(None, None, cache_path=args.cache_path)
+    cache = lookup._read_cache()
+    for server_url in cache:
+        lookup.server_url = server_url
+        for kind in args.invalidate:
+            lookup.invalidate(kind)
+    print(f"-> Invalidated: {', '.join(args.invalidate)}.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,213 @@
+# utils/resource_graph.py
+
+import hashlib
+import json
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from utils.config_context import group_fragments, render_device_contexts
+from utils.naming import (
+    asn_resource_name, config_context_resource_name, interface_template_resource_name,
+    prefix_resource_name, vlan_resource_name
+)
+from utils.vlan_allocator import iter_vlan_allocations
+
+# ===============================================
+# 1. DATA FILES & RESOURCE KINDS
+# ===============================================
+# Mirrors the reads and the wiring done in __main__.py, without Pulumi imports,
+# so CI tooling can reason about the program from the YAML data alone.
+
+DATA_FILES: Dict[str, List[str]] = {
+    'tenancy': ['data', 'organization', 'tenancy.yaml'],
+    'sites_locations': ['data', 'organization', 'sites_locations.yaml'],
+    'rirs_asns': ['data', 'ipam', 'rirs_asns.yaml'],
+    'vrfs': ['data', 'ipam', 'vrfs.yaml'],
+    'prefixes': ['data', 'ipam', 'prefixes.yaml'],
+    'vlans': ['data', 'ipam', 'vlans.yaml'],
+    'dcim': ['data', 'dcim', 'devices.yaml'],
+    'config_contexts': ['data', 'dcim', 'config_contexts.yaml'],
+}
+
+# kind -> pulumi_netbox class name
+RESOURCE_KINDS: Dict[str, str] = {
+    'tenant_group': 'TenantGroup',
+    'tenant': 'Tenant',
+    'region': 'Region',
+    'site_group': 'SiteGroup',
+    'site': 'Site',
+    'location': 'Location',
+    'rir': 'Rir',
+    'vrf': 'Vrf',
+    'asn': 'Asn',
+    'aggregate': 'Aggregate',
+    'prefix': 'Prefix',
+    'vlan_group': 'VlanGroup',
+    'vlan': 'Vlan',
+    'manufacturer': 'Manufacturer',
+    'device_role': 'DeviceRole',
+    'device_type': 'DeviceType',
+    'interface_template': 'InterfaceTemplate',
+    'config_context': 'ConfigContext',
+    'device': 'Device',
+}
+
+# Every Site is created with the 'clab' tenant ID (see __main__.py, step 2.5)
+SITE_TENANT_SLUG = 'clab'
+
+NodeKey = Tuple[str, str]
+
+
+class ResourceNode(NamedTuple):
+    """A single Pulumi resource derived from the data, with its data-level dependencies."""
+    kind: str
+    name: str
+    deps: Tuple[NodeKey, ...]
+    fingerprint: str
+
+
+def type_token(kind: str) -> str:
+    """Returns the Pulumi type token of a kind (e.g. 'netbox:index/deviceRole:DeviceRole')."""
+    class_name = RESOURCE_KINDS[kind]
+    module = class_name[0].lower() + class_name[1:]
+    return f"netbox:index/{module}:{class_name}"
+
+
+def kind_from_type_token(token: str) -> Optional[str]:
+    """Inverse of type_token(); returns None for non-NetBox or unknown types."""
+    class_name = token.rsplit(':', 1)[-1]
+    for kind, name in RESOURCE_KINDS.items():
+        if name == class_name and token == type_token(kind):
+            return kind
+    return None
+
+
+def _fingerprint(entry: Any) -> str:
+    """Stable hash of a data entry (key order independent)."""
+    payload = json.dumps(entry, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# ===============================================
+# 2. DATA LOADING
+# ===============================================
+
+def load_project_data(reader: Callable[[List[str]], Optional[dict]]) -> Dict[str, dict]:
+    """
+    Loads every data file through 'reader' (path segments -> parsed YAML or None).
+    Missing or empty files are returned as empty dictionaries.
+    """
+    return {key: reader(segments) or {} for key, segments in DATA_FILES.items()}
+
+
+# ===============================================
+# 3. GRAPH CONSTRUCTION
+# ===============================================
+
+def build_resource_graph(data: Dict[str, dict]) -> Dict[NodeKey, ResourceNode]:
+    """
+    Builds every resource the program would register from 'data' (as returned by
+    load_project_data), keyed by (kind, Pulumi resource name).
+
+    Dependencies follow the ID references made in infra/atomic/*: an edge is only
+    recorded when the referenced resource is managed by this program.
+    """
+    nodes: Dict[NodeKey, ResourceNode] = {}
+
+    def add(kind: str, name: str, entry: Any, deps: List[Optional[NodeKey]]):
+        resolved = tuple(dep for dep in deps if dep is not None and dep in nodes)
+        nodes[(kind, name)] = ResourceNode(kind, name, resolved, _fingerprint(entry))
+
+    def ref(kind: str, name: Any) -> Optional[NodeKey]:
+        return (kind, str(name)) if name is not None else None
+
+    tenancy = data.get('tenancy', {})
+    sites_locations = data.get('sites_locations', {})
+    rirs_asns = data.get('rirs_asns', {})
+    prefixes = data.get('prefixes', {})
+    dcim = data.get('dcim', {})
+
+    # --- Organization ---
+    for group in tenancy.get('tenant_groups', []):
+        add('tenant_group', group['slug'], group, [])
+    for tenant in tenancy.get('tenants', []):
+        add('tenant', tenant['slug'], tenant, [ref('tenant_group', tenant.get('group_slug'))])
+    for region in sites_locations.get('regions', []):
+        add('region', region['slug'], region, [])
+    for group in sites_locations.get('site_groups', []):
+        add('site_group', group['slug'], group, [])
+    for site in sites_locations.get('sites', []):
+        add('site', site['slug'], site, [
+            ref('site_group', site.get('group_slug')),
+            ref('tenant', SITE_TENANT_SLUG)
+        ])
+    for location in sites_locations.get('locations', []):
+        add('location', location['slug'], location, [ref('site', location.get('site_slug'))])
+
+    # --- IPAM ---
+    for rir in rirs_asns.get('rirs', []):
+        add('rir', rir['slug'], rir, [])
+    for vrf in data.get('vrfs', {}).get('vrfs', []):
+        add('vrf', vrf['slug'], vrf, [])
+    for asn in rirs_asns.get('asns', []):
+        add('asn', asn_resource_name(asn['asn']), asn, [ref('rir', asn.get('rir_slug'))])
+    for agg in prefixes.get('aggregates', []):
+        add('aggregate', prefix_resource_name(agg['prefix']), agg,
+            [ref('rir', agg.get('rir_slug'))])
+    for prefix in prefixes.get('prefixes', []):
+        add('prefix', prefix_resource_name(prefix['prefix']), prefix,
+            [ref('vrf', prefix.get('vrf_slug'))])
+    vlans = data.get('vlans', {})
+    for group in vlans.get('vlan_groups', []):
+        add('vlan_group', group['slug'], group, [ref('site', group.get('site_slug'))])
+    # Fingerprints include the allocated 'vid': VLANs moved by the allocator are changes too
+    for vlan in iter_vlan_allocations(vlans.get('vlan_groups', []), vlans.get('vlans', [])):
+        add('vlan', vlan_resource_name(vlan['group_slug'], vlan['slug']), vlan, [
+            ref('vlan_group', vlan['group_slug']),
+            ref('tenant', vlan.get('tenant_slug'))
+        ])
+
+    # --- DCIM ---
+    for manufacturer in dcim.get('manufacturers', []):
+        add('manufacturer', manufacturer['slug'], manufacturer, [])
+    for role in dcim.get('device_roles', []):
+        add('device_role', role['slug'], role, [])
+    for device_type in dcim.get('device_types', []):
+        # Interfaces are separate resources: they must not mark the Device Type as changed
+        type_entry = {k: v for k, v in device_type.items() if k != 'interfaces'}
+        add('device_type', device_type['slug'], type_entry,
+            [ref('manufacturer', device_type.get('manufacturer_slug'))])
+        for interface in device_type.get('interfaces', []):
+            add('interface_template',
+                interface_template_resource_name(device_type['slug'], interface['name']),
+                interface, [ref('device_type', device_type['slug'])])
+    context_data = data.get('config_contexts', {})
+    for scope, kind, key in [('role', 'device_role', 'role_fragments'),
+                             ('type', 'device_type', 'type_fragments')]:
+        for slugs, data_json in group_fragments(context_data.get(key)):
+            add('config_context', config_context_resource_name(scope, slugs), data_json,
+                [ref(kind, slug) for slug in slugs])
+    # Fingerprints include the rendered context: a peer change updates the device too
+    devices = dcim.get('devices') or {}
+    device_contexts = render_device_contexts(
+        devices, context_data, [asn['asn'] for asn in rirs_asns.get('asns', [])]
+    )
+    for device_name, device in devices.items():
+        device_entry = dict(device, local_context_data=device_contexts.get(device_name))
+        add('device', device_name, device_entry, [
+            ref('device_role', device.get('device_role_slug')),
+            ref('device_type', device.get('device_type_slug')),
+            ref('site', device.get('site_slug')),
+            ref('location', device.get('location_slug')),
+            ref('tenant', device.get('tenant_slug')),
+        ])
+
+    return nodes
+
+
+def reverse_dependencies(nodes: Dict[NodeKey, ResourceNode]) -> Dict[NodeKey, List[NodeKey]]:
+    """Maps each node to the nodes that directly depend on it."""
+    dependents: Dict[NodeKey, List[NodeKey]] = {key: [] for key in nodes}
+    for key, node in nodes.items():
+        for dep in node.deps:
+            dependents[dep].append(key)
+    return dependents
@@ -0,0 +1,291 @@
+# utils/state_analyzer.py
+
+"""
+Streaming analyzer for exported Pulumi stack state (checkpoints).
+
+The export is never loaded as a whole: resources are decoded one at a time,
+so memory stays bounded by the largest single resource, whatever the size
+of the state.
+
+Usage:
+    pulumi stack export | python -m utils.state_analyzer
+    python -m utils.state_analyzer state.json --large-threshold 131072 --json
+"""
+
+import argparse
+import codecs
+import heapq
+import json
+import re
+import sys
+from collections import defaultdict
+from typing import IO, Dict, Iterator, List, Optional, Set, Tuple
+
+from utils.data_reader import read_yaml_data
+from utils.resource_graph import (
+    NodeKey, build_resource_graph, kind_from_type_token, load_project_data
+)
+
+CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Key paths of the resources array in 'pulumi stack export' and raw checkpoint files
+RESOURCE_PATHS = {('deployment', 'resources'), ('checkpoint', 'latest', 'resources')}
+
+_STRUCTURAL = re.compile(r'["{}\[\]:]')
+_STRING_END = re.compile(r'["\\]')
+_SEPARATORS = re.compile(r'[\s,]*')
+
+
+# ===============================================
+# 1. STREAMING PARSER
+# ===============================================
+
+class _ChunkReader:
+    """Incrementally decodes a binary stream into text chunks."""
+
+    def __init__(self, stream: IO[bytes]):
+        self.stream = stream
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.eof = False
+
+    def read(self, size: int = CHUNK_SIZE) -> str:
+        if self.eof:
+            return ''
+        data = self.stream.read(size)
+        if not data:
+            self.eof = True
+            return self.decoder.decode(b'', final=True)
+        return self.decoder.decode(data)
+
+
+def _seek_resources_array(reader: _ChunkReader) -> Optional[str]:
+    """
+    Scans the document header (structure only, no values kept) until the opening
+    bracket of the resources array. Returns the text following that bracket, or None
+    when the document ends without one (e.g. the export of an empty stack).
+    """
+    path: List[List[Optional[str]]] = []  # [container, current key] per depth
+    in_string = False
+    key_parts: List[str] = []
+    last_string: Optional[str] = None
+    skip_next = False  # Escape sequence split across chunks
+
+    while True:
+        text = reader.read()
+        if not text:
+            raise ValueError("Truncated or invalid state export (unexpected end of input).")
+        pos = 0
+        if skip_next:
+            pos, skip_next = 1, False
+            key_parts.append(text[:1])
+
+        while pos < len(text):
+            if in_string:
+                m = _STRING_END.search(text, pos)
+                if m is None:
+                    key_parts.append(text[pos:])
+                    break
+                key_parts.append(text[pos:m.start()])
+                if m.group() == '\\':
+                    if m.end() >= len(text):
+                        skip_next = True
+                        break
+                    key_parts.append(text[m.end()])
+                    pos = m.end() + 1
+                    continue
+                in_string = False
+                last_string = ''.join(key_parts)
+                pos = m.end()
+                continue
+
+            m = _STRUCTURAL.search(text, pos)
+            if m is None:
+                break
+            char, pos = m.group(), m.end()
+            if char == '"':
+                in_string, key_parts = True, []
+            elif char == ':':
+                if not path:
+                    raise ValueError("Invalid state export (unexpected ':').")
+                path[-1][1] = last_string
+            elif char in '{[':
+                keys = tuple(entry[1] for entry in path)
+                if char == '[' and keys in RESOURCE_PATHS:
+                    return text[pos:]
+                path.append([char, None])
+            else:
+                if not path:
+                    raise ValueError("Invalid state export (unbalanced brackets).")
+                path.pop()
+                if not path:
+                    # Root value closed: a complete document without resources
+                    return None
+
+
+def iter_resources(stream: IO[bytes]) -> Iterator[Tuple[dict, int]]:
+    """Yields (resource, serialized size in bytes) for each resource of the export."""
+    reader = _ChunkReader(stream)
+    decoder = json.JSONDecoder()
+    buf = _seek_resources_array(reader)
+    if buf is None:
+        return
+    pos = 0
+    # Bytes to read before retrying a decode: the buffer doubles while a resource stays
+    # incomplete, so very large resources are not re-decoded once per chunk
+    read_size = CHUNK_SIZE
+
+    while True:
+        pos = _SEPARATORS.match(buf, pos).end()
+        if pos < len(buf) and buf[pos] == ']':
+            return
+        try:
+            resource, end = decoder.raw_decode(buf, pos)
+        except ValueError:
+            # Incomplete resource: keep the unread tail only and read more
+            buf, pos = buf[pos:], 0
+            more = reader.read(read_size)
+            if not more and reader.eof:
+                raise ValueError("Truncated state export (unterminated resources array).")
+            buf += more
+            read_size = max(CHUNK_SIZE, len(buf))
+            continue
+        read_size = CHUNK_SIZE
+        yield resource, len(buf[pos:end].encode('utf-8'))
+        pos = end
+
+
+# ===============================================
+# 2. ANALYSIS
+# ===============================================
+
+def _kind_label(resource_type: str) -> str:
+    """'netbox:index/device:Device' -> 'Device'; other types are kept verbatim."""
+    if resource_type.startswith('netbox:index/'):
+        return resource_type.rsplit(':', 1)[-1]
+    return resource_type
+
+
+def _json_size(value) -> int:
+    if value is None:
+        return 0
+    return len(json.dumps(value, separators=(',', ':')).encode('utf-8'))
+
+
+def expected_resources() -> Set[NodeKey]:
+    """Every (kind, name) the program would register from the current data/."""
+
+    def read(path_segments):
+        try:
+            return read_yaml_data(path_segments)
+        except FileNotFoundError:
+            return None
+
+    return set(build_resource_graph(load_project_data(read)))
+
+
+def analyze(
+        stream: IO[bytes],
+        expected: Set[NodeKey],
+        large_threshold: int,
+        top: int
+        ) -> Dict:
+    """Builds the report in one streaming pass; only aggregates and top-N lists are kept."""
+    counts: Dict[str, int] = defaultdict(int)
+    sizes: Dict[str, int] = defaultdict(int)
+    orphans: List[str] = []
+    large_heap: List[Tuple[int, str, str]] = []
+    large_count = 0
+    total = 0
+
+    for resource, size in iter_resources(stream):
+        total += 1
+        urn = resource.get('urn', '')
+        resource_type = resource.get('type', '')
+        label = _kind_label(resource_type)
+        counts[label] += 1
+        sizes[label] += size
+
+        kind = kind_from_type_token(resource_type)
+        if kind and not resource.get('delete') and (kind, urn.rsplit('::', 1)[-1]) not in expected:
+            orphans.append(urn)
+
+        for field in ('inputs', 'outputs'):
+            field_size = _json_size(resource.get(field))
+            if field_size >= large_threshold:
+                large_count += 1
+                entry = (field_size, urn, field)
+                if len(large_heap) < top:
+                    heapq.heappush(large_heap, entry)
+                else:
+                    heapq.heappushpop(large_heap, entry)
+
+    return {
+        'resources': total,
+        'kinds': {
+            label: {'count': counts[label], 'bytes': sizes[label]}
+            for label in sorted(counts, key=lambda label: -sizes[label])
+        },
+        'orphans': sorted(orphans),
+        'large_threshold': large_threshold,
+        'large_count': large_count,
+        'largest': [
+            {'urn': urn, 'field': field, 'bytes': field_size}
+            for field_size, urn, field in sorted(large_heap, reverse=True)
+        ],
+    }
+
+
+def _print_report(report: Dict):
+    print(f"-> {report['resources']} resource(s) in state.")
+    print(f"\n{'KIND':<40} {'COUNT':>8} {'BYTES':>14}")
+    for label, stats in report['kinds'].items():
+        print(f"{label:<40} {stats['count']:>8} {stats['bytes']:>14}")
+
+    print(f"\n-> {len(report['orphans'])} orphaned resource(s) (no matching slug in data/):")
+    for urn in report['orphans']:
+        print(f"   {urn}")
+
+    print(f"\n-> {report['large_count']} input/output(s) >= {report['large_threshold']} bytes:")
+    for entry in report['largest']:
+        print(f"   {entry['bytes']:>12}  {entry['field']:<8} {entry['urn']}")
+
+
+# ===============================================
+# 3. COMMAND LINE
+# ===============================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('file', nargs='?', default='-',
+                        help="State export file (default: stdin).")
+    parser.add_argument('--large-threshold', type=int, default=64 * 1024,
+                        help="Flag inputs/outputs of at least this many bytes.")
+    parser.add_argument('--top', type=int, default=20,
+                        help="Number of largest inputs/outputs to list.")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON.")
+    parser.add_argument('--fail-on-orphans', action='store_true',
+                        help="Exit with status 1 when orphaned resources are found.")
+    args = parser.parse_args(argv)
+
+    try:
+        # Invalid data/ (YAML error, VLAN/loopback collision, ...) is reported like bad input
+        expected = expected_resources()
+        if args.file == '-':
+            report = analyze(sys.stdin.buffer, expected, args.large_threshold, args.top)
+        else:
+            with open(args.file, 'rb') as f:
+                report = analyze(f, expected, args.large_threshold, args.top)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+    return 1 if args.fail_on_orphans and report['orphans'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+# utils/vlan_allocator.py
+
+import hashlib
+from typing import Any, Dict, Iterable, Iterator, List
+
+from utils.naming import vlan_resource_name
+
+VLAN_ID_MIN = 1
+VLAN_ID_MAX = 4094
+
+
+class VlanIdAllocator:
+    """
+    VLAN ID allocator of ONE VLAN group, backed by a 4096-bit bitmap (a Python int).
+
+    A VLAN without an explicit ID gets the ID derived from its slug (stable hash) when
+    it is free, else the next free ID after it (found with a few bitwise operations).
+    Allocation only fails when the pool is full.
+    """
+
+    def __init__(self, min_vid: int = VLAN_ID_MIN, max_vid: int = VLAN_ID_MAX):
+        if not VLAN_ID_MIN <= min_vid <= max_vid <= VLAN_ID_MAX:
+            raise ValueError(f"Invalid VLAN ID range {min_vid}-{max_vid}.")
+        self.min_vid = min_vid
+        self.max_vid = max_vid
+        # Bit N set = VLAN ID N in range; bits are cleared as IDs are taken
+        self._free = ((1 << (max_vid + 1)) - 1) ^ ((1 << min_vid) - 1)
+        self._owners: Dict[int, str] = {}
+
+    def slug_vid(self, slug: str) -> int:
+        """The VLAN ID derived from a slug (independent of any other VLAN)."""
+        digest = hashlib.sha256(slug.encode('utf-8')).digest()
+        return self.min_vid + int.from_bytes(digest[:8], 'big') % (
+            self.max_vid - self.min_vid + 1
+            )
+
+    def next_free(self, start: int) -> int:
+        """First free VLAN ID at/after 'start', wrapping around (-1 if the pool is full)."""
+        candidates = self._free >> start << start or self._free
+        # Lowest set bit = first free VLAN ID
+        return (candidates & -candidates).bit_length() - 1
+
+    def reserve(self, vid: int, owner: str) -> int:
+        """Marks a VLAN ID as used by 'owner'."""
+        if not self.min_vid <= vid <= self.max_vid:
+            raise ValueError(f"VLAN ID {vid} is outside {self.min_vid}-{self.max_vid}.")
+        if not self._free >> vid & 1:
+            raise ValueError(f"VLAN ID {vid} is already used by '{self._owners[vid]}'.")
+        self._free &= ~(1 << vid)
+        self._owners[vid] = owner
+        return vid
+
+    def allocate_all(self, slugs: Iterable[str]) -> Dict[str, int]:
+        """
+        Allocates an ID to every slug, deterministically (independent of the input order):
+        1. each slug takes its derived ID if free (on a tie, the smallest slug wins);
+        2. the remaining slugs, in sorted order, take the next free ID after theirs.
+        A VLAN holding its derived ID only moves if an explicit 'vid' (or a smaller slug
+        with the same derived ID) claims it; the VLANs of step 2 may move when the VLANs
+        around them change (pin them with 'vid' to freeze them).
+        """
+        vids: Dict[str, int] = {}
+        collided = []
+        for slug in sorted(slugs):
+            vid = self.slug_vid(slug)
+            if self._free >> vid & 1:
+                vids[slug] = self.reserve(vid, slug)
+            else:
+                collided.append(slug)
+
+        for slug in collided:
+            vid = self.next_free(self.slug_vid(slug))
+            if vid < 0:
+                raise ValueError(f"No VLAN ID left in {self.min_vid}-{self.max_vid}.")
+            vids[slug] = self.reserve(vid, slug)
+        return vids
+
+
+def _expand_vlans(vlan_data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Expands 'count: N' entries into N VLANs ('<slug>-1'..'<slug>-N')."""
+    expanded = []
+    for vlan_data in vlan_data_list:
+        count = vlan_data.get('count')
+        if count is None:
+            expanded.append(dict(vlan_data))
+            continue
+        base = {k: v for k, v in vlan_data.items() if k not in ('count', 'pins')}
+        pins = vlan_data.get('pins') or {}
+        for index in range(1, count + 1):
+            entry = dict(base, slug=f"{base['slug']}-{index}", name=f"{base['name']}-{index}")
+            if 'vid' in base:
+                entry['vid'] = base['vid'] + index - 1
+            elif index in pins:
+                entry['vid'] = pins[index]
+            expanded.append(entry)
+    return expanded
+
+
+def iter_vlan_allocations(
+        group_data_list: List[Dict[str, Any]],
+        vlan_data_list: List[Dict[str, Any]]
+        ) -> Iterator[Dict[str, Any]]:
+    """
+    Generator yielding every VLAN entry with its resolved 'vid'.
+
+    - Entries with 'count: N' expand to N VLANs; an explicit 'vid' then pins the first
+      of N consecutive IDs, and 'pins: {<index>: <vid>}' pins single expanded VLANs.
+    - Explicit IDs are reserved first; the other VLANs of each group are then allocated
+      together (see VlanIdAllocator.allocate_all), so IDs do not depend on file order.
+    """
+    allocators = {
+        group['slug']: VlanIdAllocator(group.get('min_vid', VLAN_ID_MIN),
+                                       group.get('max_vid', VLAN_ID_MAX))
+        for group in group_data_list
+    }
+    expanded = _expand_vlans(vlan_data_list)
+
+    def context(entry):
+        return f"VLAN '{entry['slug']}' (group '{entry['group_slug']}')"
+
+    resource_names = set()
+    for entry in expanded:
+        if entry['group_slug'] not in allocators:
+            raise ValueError(f"{context(entry)}: unknown VLAN group '{entry['group_slug']}'.")
+        resource_name = vlan_resource_name(entry['group_slug'], entry['slug'])
+        if resource_name in resource_names:
+            raise ValueError(f"{context(entry)}: duplicate VLAN slug.")
+        resource_names.add(resource_name)
+
+    for entry in expanded:
+        if 'vid' in entry:
+            try:
+                allocators[entry['group_slug']].reserve(entry['vid'], entry['slug'])
+            except ValueError as e:
+                raise ValueError(f"{context(entry)}: {e}") from e
+
+    derived: Dict[str, List[str]] = {}  # group slug -> slugs without an explicit ID
+    for entry in expanded:
+        if 'vid' not in entry:
+            derived.setdefault(entry['group_slug'], []).append(entry['slug'])
+
+    allocated = {}
+    for group_slug, slugs in derived.items():
+        try:
+            allocated[group_slug] = allocators[group_slug].allocate_all(slugs)
+        except ValueError as e:
+            raise ValueError(f"VLAN group '{group_slug}': {e}") from e
+
+    for entry in expanded:
+        if 'vid' not in entry:
+            entry['vid'] = allocated[entry['group_slug']][entry['slug']]
+        yield entry